@@ -8,6 +8,9 @@ Features: in-category search, combined filters, watch history, smart sorting.
 import sys
 import os
 import time
+import functools
+import collections
+from operator import itemgetter
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "resources", "lib"))
 
@@ -24,35 +27,66 @@ import xbmc
 import xbmcvfs
 
 from resources.lib import rainfocus
-from resources.lib import brightcove
-from resources.lib import history
+# brightcove and history are imported lazily by the actions that need
+# them, keeping them off the import path of every browse click
 
 ADDON = xbmcaddon.Addon()
 ADDON_URL = sys.argv[0]
 ADDON_HANDLE = int(sys.argv[1])
 ADDON_ARGS = sys.argv[2]
 
-# Settings helpers
-def _setting_bool(key, default=False):
-    try:
-        return ADDON.getSettingBool(key)
-    except Exception:
-        return default
-
-def _setting_int(key, default=0):
-    try:
-        return ADDON.getSettingInt(key)
-    except Exception:
-        return default
-
-SHOW_NO_VIDEO = _setting_bool("show_no_video", False)
-SHOW_CODES = _setting_bool("show_session_codes", False)
+# Settings are read once per invocation, all under a single guard, and
+# handed to the per-item builders as a small immutable record
+_SessionSettings = collections.namedtuple(
+    "_SessionSettings",
+    ["show_no_video", "show_session_codes", "show_level_colors",
+     "warm_cache"])
+_SETTING_DEFAULTS = _SessionSettings(show_no_video=False,
+                                     show_session_codes=False,
+                                     show_level_colors=True,
+                                     warm_cache=False)
+try:
+    _SETTINGS = _SessionSettings(
+        show_no_video=ADDON.getSettingBool("show_no_video"),
+        show_session_codes=ADDON.getSettingBool("show_session_codes"),
+        show_level_colors=ADDON.getSettingBool("show_level_colors"),
+        warm_cache=ADDON.getSettingBool("warm_cache"),
+    )
+except Exception:
+    _SETTINGS = _SETTING_DEFAULTS
+
+# Fanart ships with the addon, so no existence check is needed (Kodi
+# ignores a missing image anyway); build the art dict once per process
+_ADDON_PATH = xbmcvfs.translatePath(ADDON.getAddonInfo("path"))
+_FANART_ART = {"fanart": os.path.join(_ADDON_PATH, "resources", "media",
+                                      "fanart.jpg")}
+
+# Shared icon art for folder listings (Kodi copies the dict on setArt)
+_ICON_PLAYLISTS = {"icon": "DefaultVideoPlaylists.png"}
+_ICON_GENRE = {"icon": "DefaultGenre.png"}
+_ICON_PROGRAM = {"icon": "DefaultProgram.png"}
 
 
 def build_url(action, **kwargs):
+    if not kwargs:
+        # Fast path: a bare action needs no urlencode machinery
+        return f"{ADDON_URL}?action={quote_plus(action)}"
     params = {"action": action}
     params.update(kwargs)
-    return "{}?{}".format(ADDON_URL, urlencode(params))
+    return f"{ADDON_URL}?{urlencode(params, doseq=True)}"
+
+
+# Session rows build one of these per item; format + quote_plus is much
+# cheaper than urlencode and yields the same query string
+_PLAY_URL = ADDON_URL + ("?action=play&video_id={}&session_id={}"
+                         "&title={}&code={}&event={}")
+_INFO_URL = ADDON_URL + "?action=info&session_id={}"
+
+
+def _play_url(video_id, session_id, title, code, event):
+    # The API sends null for some fields; urlencode used to str() them
+    return _PLAY_URL.format(*(quote_plus(v or "") for v in (
+        video_id, session_id, title, code, event)))
 
 
 def get_params():
@@ -63,50 +97,89 @@ def get_params():
 # Level color badges
 # ---------------------------------------------------------------------------
 
-LEVEL_COLORS = {
-    "Introductory": ("green", "[COLOR green]\u25cf[/COLOR]"),
-    "Intermediate": ("yellow", "[COLOR yellow]\u25cf[/COLOR]"),
-    "Advanced":     ("orange", "[COLOR orange]\u25cf[/COLOR]"),
-    "Expert":       ("red",    "[COLOR red]\u25cf[/COLOR]"),
-    "General":      ("white",  "[COLOR white]\u25cf[/COLOR]"),
+LEVEL_BADGE_STR = {
+    "Introductory": "[COLOR green]\u25cf[/COLOR] Introductory",
+    "Intermediate": "[COLOR yellow]\u25cf[/COLOR] Intermediate",
+    "Advanced":     "[COLOR orange]\u25cf[/COLOR] Advanced",
+    "Expert":       "[COLOR red]\u25cf[/COLOR] Expert",
+    "General":      "[COLOR white]\u25cf[/COLOR] General",
 }
 
 
+# Chosen once from the settings: unknown levels (and all levels when
+# colours are off) fall through to the plain name
+_LEVEL_DISPLAY = LEVEL_BADGE_STR if _SETTINGS.show_level_colors else {}
+
+
 def _level_badge(level):
-    entry = LEVEL_COLORS.get(level)
-    if entry:
-        return "{} {}".format(entry[1], level)
-    return level
+    return _LEVEL_DISPLAY.get(level, level)
+
+
+# ---------------------------------------------------------------------------
+# Filter id -> name lookups
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def _tech_lookup():
+    return {t["id"]: t["name"] for t in rainfocus.get_technologies()}
+
+
+@functools.lru_cache(maxsize=1)
+def _level_lookup():
+    return {lv["id"]: lv["name"] for lv in rainfocus.get_levels()}
 
 
 # ---------------------------------------------------------------------------
 # Main Menu (content-first)
 # ---------------------------------------------------------------------------
 
-def main_menu():
-    xbmcplugin.setContent(ADDON_HANDLE, "videos")
+_ICON_RECENT = {"icon": "DefaultRecentlyAddedVideos.png"}
+
+# Static menus: (label, url, art), with URLs built once at import
+_MAIN_MENU_ITEMS = (
+    ("New Releases",        build_url("new_releases"), _ICON_RECENT),
+    ("Browse by Event",     build_url("events"),       _ICON_PLAYLISTS),
+    ("Browse by Category",  build_url("categories"),   _ICON_GENRE),
+    ("Search All Sessions", build_url("search"),       {"icon": "DefaultAddonsSearch.png"}),
+    ("Continue Watching",   build_url("history"),      _ICON_RECENT),
+    ("About",               build_url("about"),        {"icon": "DefaultAddonHelper.png"}),
+)
+
+_CATEGORY_ITEMS = (
+    ("Technology",      build_url("technologies"), _ICON_GENRE),
+    ("Technical Level", build_url("levels"),       _ICON_PROGRAM),
+)
 
-    items = [
-        ("New Releases",                  build_url("new_releases"),  "DefaultRecentlyAddedVideos.png"),
-        ("Browse by Event",               build_url("events"),        "DefaultVideoPlaylists.png"),
-        ("Browse by Category",            build_url("categories"),    "DefaultGenre.png"),
-        ("Search All Sessions",           build_url("search"),        "DefaultAddonsSearch.png"),
-        ("Continue Watching",             build_url("history"),       "DefaultRecentlyAddedVideos.png"),
-        ("About",                         build_url("about"),         "DefaultAddonHelper.png"),
-    ]
-    for label, url, icon in items:
+
+def _add_static_menu(items):
+    listing = []
+    for label, url, art in items:
         li = xbmcgui.ListItem(label)
-        li.setArt({"icon": icon})
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        li.setArt(art)
+        listing.append((url, li, True))
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
 
 
+def main_menu():
+    xbmcplugin.setContent(ADDON_HANDLE, "videos")
+    _add_static_menu(_MAIN_MENU_ITEMS)
+    # The menu is already on screen; on a cold cache, start fetching what
+    # the next click most likely needs
+    if _SETTINGS.warm_cache:
+        rainfocus.warm_cache({_NEW_RELEASES_FILTER[0]: _NEW_RELEASES_FILTER[1]})
+
+
 # ---------------------------------------------------------------------------
 # New Releases
 # ---------------------------------------------------------------------------
 
+_NEW_RELEASES_FILTER = ("search.featuredsessions", "New_Releases")
+
+
 def show_new_releases():
-    show_session_list(filter_key="search.featuredsessions", filter_val="New_Releases")
+    show_session_list(filter_key=_NEW_RELEASES_FILTER[0],
+                      filter_val=_NEW_RELEASES_FILTER[1])
 
 
 # ---------------------------------------------------------------------------
@@ -119,6 +192,7 @@ def show_events():
     if not events:
         events = rainfocus.get_events()
 
+    listing = []
     for ev in events:
         name = ev["name"]
         total = ev.get("total", "")
@@ -126,7 +200,7 @@ def show_events():
         section_id = ev.get("section_id", "")
         label = "{} ({})".format(name, total) if total else name
         li = xbmcgui.ListItem(label)
-        li.setArt({"icon": "DefaultVideoPlaylists.png"})
+        li.setArt(_ICON_PLAYLISTS)
         if section_id:
             # Current catalog: use section-based browsing
             url = build_url("event_section", section_id=section_id,
@@ -136,17 +210,20 @@ def show_events():
             url = build_url("list", search_text=name,
                              event_name=name, filter_label=name,
                              catalog="legacy")
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
 
 
 def show_technologies():
+    listing = []
     for t in rainfocus.get_technologies():
         li = xbmcgui.ListItem(t["name"])
-        li.setArt({"icon": "DefaultGenre.png"})
+        li.setArt(_ICON_GENRE)
         url = build_url("list", filter_key="search.technology", filter_val=t["id"],
                          filter_label=t["name"])
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
 
 
@@ -172,21 +249,29 @@ def show_event_section(section_id, event_name="", page=0,
     if keyword:
         nav_base["keyword"] = keyword
 
+    listing = []
+
     # -- Sticky filter bar at top (page 0 only) --
     if page == 0:
         has_any_filter = bool(tech_ids or level_ids or keyword)
 
+        # Resolve selected filter names once for the summary and filter rows
+        tech_names = ""
+        if tech_ids:
+            tech_lookup = _tech_lookup()
+            tech_names = ", ".join(tech_lookup.get(tid, tid) for tid in tech_ids)
+        level_names = ""
+        if level_ids:
+            level_lookup = _level_lookup()
+            level_names = ", ".join(level_lookup.get(lid, lid) for lid in level_ids)
+
         # Active filter summary + clear option
         if has_any_filter:
             parts = []
-            if tech_ids:
-                tech_lookup = {t["id"]: t["name"] for t in rainfocus.get_technologies()}
-                names = [tech_lookup.get(tid, tid) for tid in tech_ids]
-                parts.append("Tech: " + ", ".join(names))
-            if level_ids:
-                level_lookup = {lv["id"]: lv["name"] for lv in rainfocus.get_levels()}
-                names = [level_lookup.get(lid, lid) for lid in level_ids]
-                parts.append("Level: " + ", ".join(names))
+            if tech_names:
+                parts.append("Tech: " + tech_names)
+            if level_names:
+                parts.append("Level: " + level_names)
             if keyword:
                 parts.append('"{}"'.format(keyword))
 
@@ -196,33 +281,29 @@ def show_event_section(section_id, event_name="", page=0,
             li.setArt({"icon": "DefaultIconError.png"})
             url = build_url("event_section", section_id=section_id,
                              event_name=event_name)
-            xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+            listing.append((url, li, True))
 
         # Technology filter (show current selection or "Filter by")
         tech_label = "[COLOR cyan]Filter by Technology[/COLOR]"
-        if tech_ids:
-            tech_lookup = {t["id"]: t["name"] for t in rainfocus.get_technologies()}
-            names = [tech_lookup.get(tid, tid) for tid in tech_ids]
+        if tech_names:
             tech_label = "[COLOR cyan]Technology: {} (change)[/COLOR]".format(
-                ", ".join(names))
+                tech_names)
         li = xbmcgui.ListItem(tech_label)
         li.setArt({"icon": "DefaultGenre.png"})
         url = build_url("event_filter_pick", filter_type="technology",
                          **nav_base)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
 
         # Level filter
         level_label = "[COLOR cyan]Filter by Technical Level[/COLOR]"
-        if level_ids:
-            level_lookup = {lv["id"]: lv["name"] for lv in rainfocus.get_levels()}
-            names = [level_lookup.get(lid, lid) for lid in level_ids]
+        if level_names:
             level_label = "[COLOR cyan]Level: {} (change)[/COLOR]".format(
-                ", ".join(names))
+                level_names)
         li = xbmcgui.ListItem(level_label)
         li.setArt({"icon": "DefaultProgram.png"})
         url = build_url("event_filter_pick", filter_type="level",
                          **nav_base)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
 
         # Keyword search
         kw_label = "[COLOR cyan]Search within this event[/COLOR]"
@@ -231,7 +312,7 @@ def show_event_section(section_id, event_name="", page=0,
         li = xbmcgui.ListItem(kw_label)
         li.setArt({"icon": "DefaultAddonsSearch.png"})
         url = build_url("event_keyword_search", **nav_base)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
 
     # -- Build API filters (repeated keys for multi-value) --
     filters = {}
@@ -245,17 +326,20 @@ def show_event_section(section_id, event_name="", page=0,
     result = rainfocus.search_event_sessions(
         section_id=section_id, page=page, page_size=rainfocus.PAGE_SIZE,
         event_name=event_name, filters=filters)
-    items = result.get("items", [])
+    items = _intern_fields(result.get("items", []))
     total = result.get("total", 0)
 
     if not items and page == 0:
         xbmcgui.Dialog().notification(
             "Cisco Live", "No sessions found", xbmcgui.NOTIFICATION_INFO)
+        xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
         xbmcplugin.endOfDirectory(ADDON_HANDLE)
         return
 
-    for item in items:
-        _add_session_item(item)
+    for item, dur_label in zip(items, _duration_labels(items)):
+        entry = _add_session_item(item, _SETTINGS, dur_label)
+        if entry:
+            listing.append(entry)
 
     # Pagination
     next_offset = (page + 1) * rainfocus.PAGE_SIZE
@@ -270,8 +354,9 @@ def show_event_section(section_id, event_name="", page=0,
         pg_params = dict(nav_base)
         pg_params["page"] = str(page + 1)
         url = build_url("event_section", **pg_params)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
 
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.addSortMethod(ADDON_HANDLE, xbmcplugin.SORT_METHOD_UNSORTED)
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
     xbmc.executebuiltin("Container.SetViewMode(500)")
@@ -333,35 +418,31 @@ def _event_keyword_search(section_id, event_name,
 
 
 def show_levels():
+    listing = []
     for lv in rainfocus.get_levels():
         li = xbmcgui.ListItem(_level_badge(lv["name"]))
-        li.setArt({"icon": "DefaultProgram.png"})
+        li.setArt(_ICON_PROGRAM)
         url = build_url("list", filter_key="search.technicallevel", filter_val=lv["id"],
                          filter_label=lv["name"])
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
 
 
 def show_session_types():
+    listing = []
     for st in rainfocus.get_session_types():
         li = xbmcgui.ListItem(st["name"])
-        li.setArt({"icon": "DefaultVideoPlaylists.png"})
+        li.setArt(_ICON_PLAYLISTS)
         url = build_url("list", filter_key="search.sessiontype", filter_val=st["id"],
                          filter_label=st["name"])
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
 
 
 def show_categories():
-    items = [
-        ("Technology",      build_url("technologies"),  "DefaultGenre.png"),
-        ("Technical Level", build_url("levels"),         "DefaultProgram.png"),
-    ]
-    for label, url, icon in items:
-        li = xbmcgui.ListItem(label)
-        li.setArt({"icon": icon})
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
-    xbmcplugin.endOfDirectory(ADDON_HANDLE)
+    _add_static_menu(_CATEGORY_ITEMS)
 
 
 # ---------------------------------------------------------------------------
@@ -394,22 +475,23 @@ def do_refine(filter_key=None, filter_val=None, filter_label=None,
     """Let user pick an additional filter to combine with current one."""
     dialog = xbmcgui.Dialog()
 
-    # Build refine options based on what's NOT already filtered
+    # Build refine options based on what's NOT already filtered.
+    # Sub-lists are fetched lazily, only for the option the user picks.
     options = []
     option_data = []
 
     if filter_key != "search.event":
         options.append("Filter by Event")
-        option_data.append(("event", rainfocus.get_events()))
+        option_data.append(("event", rainfocus.get_events))
     if filter_key != "search.technology":
         options.append("Filter by Technology")
-        option_data.append(("tech", rainfocus.get_technologies()))
+        option_data.append(("tech", rainfocus.get_technologies))
     if filter_key != "search.technicallevel":
         options.append("Filter by Technical Level")
-        option_data.append(("level", rainfocus.get_levels()))
+        option_data.append(("level", rainfocus.get_levels))
     if filter_key != "search.sessiontype":
         options.append("Filter by Session Type")
-        option_data.append(("type", rainfocus.get_session_types()))
+        option_data.append(("type", rainfocus.get_session_types))
 
     if not options:
         dialog.notification("Cisco Live", "No additional filters available",
@@ -420,7 +502,8 @@ def do_refine(filter_key=None, filter_val=None, filter_label=None,
     if choice < 0:
         return
 
-    kind, items = option_data[choice]
+    kind, fetch_items = option_data[choice]
+    items = fetch_items()
 
     # Show sub-choices
     names = [i["name"] for i in items]
@@ -508,10 +591,7 @@ def show_session_list(page=0, filter_key=None, filter_val=None,
     if search_text:
         filters["search"] = search_text
     if extra_filters:
-        for pair in extra_filters.split("&"):
-            if "=" in pair:
-                k, v = pair.split("=", 1)
-                filters[k] = v
+        filters.update(parse_qsl(extra_filters))
 
     # Common URL params for navigation items
     nav_params = {}
@@ -530,6 +610,7 @@ def show_session_list(page=0, filter_key=None, filter_val=None,
         nav_params["catalog"] = catalog
 
     # -- Top navigation items --
+    listing = []
 
     # 1. Search within this category
     if filter_key or search_text:
@@ -538,7 +619,7 @@ def show_session_list(page=0, filter_key=None, filter_val=None,
         li = xbmcgui.ListItem(search_label)
         li.setArt({"icon": "DefaultAddonsSearch.png"})
         url = build_url("search_in", **nav_params)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
 
     # 2. Refine (add more filters)
     if filter_key:
@@ -546,7 +627,7 @@ def show_session_list(page=0, filter_key=None, filter_val=None,
         li = xbmcgui.ListItem(refine_label)
         li.setArt({"icon": "DefaultAddonService.png"})
         url = build_url("refine", **nav_params)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
 
     # 3. Sort
     current_sort = "Default"
@@ -558,13 +639,13 @@ def show_session_list(page=0, filter_key=None, filter_val=None,
     li = xbmcgui.ListItem(sort_label)
     li.setArt({"icon": "DefaultIconInfo.png"})
     url = build_url("sort", **nav_params)
-    xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+    listing.append((url, li, True))
 
     # -- Fetch sessions --
     result = rainfocus.search_sessions(
         page=page, page_size=rainfocus.PAGE_SIZE, filters=filters,
         profile_id=profile_id)
-    items = result.get("items", [])
+    items = _intern_fields(result.get("items", []))
     total = result.get("total", 0)
 
     # Client-side event filtering (API doesn't support search.event)
@@ -574,22 +655,25 @@ def show_session_list(page=0, filter_key=None, filter_val=None,
     if not items and page == 0:
         xbmcgui.Dialog().notification(
             "Cisco Live", "No sessions found", xbmcgui.NOTIFICATION_INFO)
+        xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
         xbmcplugin.endOfDirectory(ADDON_HANDLE)
         return
 
     # Client-side sort
     if sort_by == "title_asc":
-        items.sort(key=lambda x: x.get("title", "").lower())
+        items.sort(key=itemgetter("_title_key"))
     elif sort_by == "title_desc":
-        items.sort(key=lambda x: x.get("title", "").lower(), reverse=True)
+        items.sort(key=itemgetter("_title_key"), reverse=True)
     elif sort_by == "duration_asc":
-        items.sort(key=lambda x: x.get("duration", 0))
+        items.sort(key=itemgetter("duration"))
     elif sort_by == "duration_desc":
-        items.sort(key=lambda x: x.get("duration", 0), reverse=True)
+        items.sort(key=itemgetter("duration"), reverse=True)
 
     # Add session items
-    for item in items:
-        _add_session_item(item)
+    for item, dur_label in zip(items, _duration_labels(items)):
+        entry = _add_session_item(item, _SETTINGS, dur_label)
+        if entry:
+            listing.append(entry)
 
     # Pagination
     next_offset = (page + 1) * rainfocus.PAGE_SIZE
@@ -606,73 +690,119 @@ def show_session_list(page=0, filter_key=None, filter_val=None,
         if sort_by != "default":
             pg_params["sort_by"] = sort_by
         url = build_url("list", **pg_params)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+        listing.append((url, li, True))
 
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.addSortMethod(ADDON_HANDLE, xbmcplugin.SORT_METHOD_UNSORTED)
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
     # Set Wall view (500) as default for session lists
     xbmc.executebuiltin("Container.SetViewMode(500)")
 
-def _add_session_item(item):
-    """Add a single session to the directory listing."""
-    title = item.get("title", "")
-    code = item.get("code", "")
-    has_video = item.get("has_video", False)
 
+def _intern_fields(items):
+    """Intern the closed-vocabulary fields of a freshly decoded page.
+
+    A page repeats the same handful of event/level/type/technology names
+    once per item; interning collapses them to one object each.
+    """
+    intern = sys.intern
+    for it in items:
+        # The API sends null for some of these; treat it as empty
+        it["event"] = intern(it.get("event") or "")
+        it["level"] = intern(it.get("level") or "")
+        it["session_type"] = intern(it.get("session_type") or "")
+        it["technologies"] = [intern(t or "")
+                              for t in it.get("technologies") or []]
+    return items
+
+
+# Plot lines for a session, in display order: (label, value getter)
+_TAG_FMT = "[B]%s:[/B] %s"
+_PLOT_FIELDS = (
+    ("Event", lambda item: item.get("event", "")),
+    ("Session", lambda item: item.get("code", "")),
+    ("Type", lambda item: item.get("session_type", "")),
+    ("Level", lambda item: item.get("level", "")),
+    ("Technology", lambda item: ", ".join(item.get("technologies", []))),
+    ("Speaker(s)", lambda item: ", ".join(
+        s for s in item.get("speakers", []) if s)),
+)
+
+
+def _add_session_item(item, settings, dur_label=""):
+    """Build the directory entry for a single session.
+
+    ``settings`` is the _SessionSettings record read once per invocation;
+    ``dur_label`` comes from _duration_labels for the whole page.
+
+    Returns a (url, listitem, is_folder) tuple for addDirectoryItems,
+    or None if the session is filtered out.
+    """
+    if item.get("has_video", False):
+        return _add_playable_item(item, settings, dur_label)
     # Skip no-video sessions unless setting enabled
-    if not has_video and not SHOW_NO_VIDEO:
-        return
+    if settings.show_no_video:
+        return _add_nonplayable_item(item, settings, dur_label)
+    return None
 
-    # Label: title only by default, or "CODE - Title" if setting enabled
-    if SHOW_CODES and code:
-        label = "{} - {}".format(code, title)
-    else:
-        label = title
 
-    if not has_video:
-        label = "[COLOR grey]{}[/COLOR]".format(label)
+def _session_label(item, settings):
+    """Title only by default, or "CODE - Title" if the setting is enabled."""
+    title = item.get("title", "")
+    code = item.get("code", "")
+    if settings.show_session_codes and code:
+        return "{} - {}".format(code, title)
+    return title
 
-    li = xbmcgui.ListItem(label)
 
-    # Build subtitle parts
+def _duration_labels(items):
+    """Duration labels for a whole page, in item order.
+
+    Sessions share a few standard lengths, so each distinct duration is
+    formatted once per page.
+    """
+    seen = {}
+    labels = []
+    for item in items:
+        secs = item.get("duration") or 0
+        label = seen.get(secs)
+        if label is None:
+            label = ""
+            if secs > 0:
+                hours, mins = divmod(int(secs) // 60, 60)
+                label = f"{hours}h {mins}m" if hours else f"{mins} min"
+            seen[secs] = label
+        labels.append(label)
+    return labels
+
+
+def _session_label2(item, dur_label):
+    """Subtitle: first technology, level badge and duration."""
     sub_parts = []
     if item.get("technologies"):
         sub_parts.append(item["technologies"][0])
     if item.get("level"):
         sub_parts.append(_level_badge(item["level"]))
-    if item.get("duration") and item["duration"] > 0:
-        mins = int(item["duration"] / 60)
-        if mins >= 60:
-            sub_parts.append("{}h {}m".format(mins // 60, mins % 60))
-        else:
-            sub_parts.append("{} min".format(mins))
-    if sub_parts:
-        li.setLabel2(" \u2022 ".join(sub_parts))
+    if dur_label:
+        sub_parts.append(dur_label)
+    return " \u2022 ".join(sub_parts)
+
+
+def _add_playable_item(item, settings, dur_label):
+    title = item.get("title") or ""
+    li = xbmcgui.ListItem(_session_label(item, settings))
+    label2 = _session_label2(item, dur_label)
+    if label2:
+        li.setLabel2(label2)
 
     # Build detailed plot
-    speakers = ", ".join(s for s in item.get("speakers", []) if s)
-    abstract = item.get("abstract", "")
     event = item.get("event", "")
-    level = item.get("level", "")
-    techs = ", ".join(item.get("technologies", []))
-    stype = item.get("session_type", "")
-
     plot_parts = []
-    if event:
-        plot_parts.append("[B]Event:[/B] {}".format(event))
-    if code:
-        plot_parts.append("[B]Session:[/B] {}".format(code))
-    if stype:
-        plot_parts.append("[B]Type:[/B] {}".format(stype))
-    if level:
-        plot_parts.append("[B]Level:[/B] {}".format(level))
-    if techs:
-        plot_parts.append("[B]Technology:[/B] {}".format(techs))
-    if speakers:
-        plot_parts.append("[B]Speaker(s):[/B] {}".format(speakers))
-    if not has_video:
-        plot_parts.append("")
-        plot_parts.append("[COLOR red]No video recording available[/COLOR]")
+    for name, getter in _PLOT_FIELDS:
+        value = getter(item)
+        if value:
+            plot_parts.append(_TAG_FMT % (name, value))
+    abstract = item.get("abstract", "")
     if abstract:
         plot_parts.append("")
         plot_parts.append(abstract)
@@ -685,28 +815,27 @@ def _add_session_item(item):
     if event:
         info_tag.setStudios([event])
 
-    # Thumbnails
-    photos = [p for p in item.get("speaker_photos", []) if p]
-    if photos:
-        li.setArt({"thumb": photos[0]})
+    # Artwork: thumbnail + fanart in a single setArt call
+    thumb = next((p for p in item.get("speaker_photos", []) if p), None)
+    if thumb:
+        li.setArt(dict(_FANART_ART, thumb=thumb))
+    else:
+        li.setArt(_FANART_ART)
 
-    # Fanart
-    fanart = os.path.join(
-        ADDON.getAddonInfo("path"), "resources", "media", "fanart.jpg")
-    if os.path.exists(fanart):
-        li.setArt({"fanart": fanart})
+    li.setProperty("IsPlayable", "true")
+    url = _play_url(item["video_ids"][0], item.get("id"), title,
+                    item.get("code"), event)
+    return url, li, False
 
-    if has_video:
-        li.setProperty("IsPlayable", "true")
-        video_id = item["video_ids"][0]
-        url = build_url("play", video_id=video_id,
-                         session_id=item.get("id", ""),
-                         title=title, code=code,
-                         event=item.get("event", ""))
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=False)
-    else:
-        url = build_url("info", session_id=item.get("id", ""))
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=False)
+
+def _add_nonplayable_item(item, settings, dur_label):
+    """Greyed-out row without info tag or art; it opens the info dialog."""
+    li = xbmcgui.ListItem(
+        "[COLOR grey]{}[/COLOR]".format(_session_label(item, settings)))
+    label2 = _session_label2(item, dur_label)
+    if label2:
+        li.setLabel2(label2)
+    return _INFO_URL.format(quote_plus(item.get("id") or "")), li, False
 
 
 # ---------------------------------------------------------------------------
@@ -715,6 +844,9 @@ def _add_session_item(item):
 
 def play_video(video_id, title="", session_id="", code="", event=""):
     """Resolve and play a Brightcove video."""
+    from resources.lib import brightcove
+    from resources.lib import history
+
     xbmc.log("CiscoLive: Resolving video {} (session={})".format(
         video_id, session_id), xbmc.LOGINFO)
 
@@ -758,6 +890,8 @@ def play_video(video_id, title="", session_id="", code="", event=""):
 
 def show_history():
     """Show recently watched sessions."""
+    from resources.lib import history
+
     xbmcplugin.setContent(ADDON_HANDLE, "videos")
     entries = history.get_recent(50)
 
@@ -768,10 +902,11 @@ def show_history():
         return
 
     # Clear history option at top
+    listing = []
     li = xbmcgui.ListItem("[COLOR red]X  Clear watch history[/COLOR]")
     li.setArt({"icon": "DefaultIconError.png"})
     url = build_url("clear_history")
-    xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=True)
+    listing.append((url, li, True))
 
     for entry in entries:
         title = entry.get("title", "Unknown")
@@ -779,7 +914,7 @@ def show_history():
         event = entry.get("event", "")
         video_id = entry.get("video_id", "")
 
-        if SHOW_CODES and code:
+        if _SETTINGS.show_session_codes and code:
             label = "{} - {}".format(code, title)
         else:
             label = title
@@ -795,174 +930,224 @@ def show_history():
             info_tag.setPlot("[B]Event:[/B] {}\n[B]Session:[/B] {}".format(
                 event, code))
 
-        url = build_url("play", video_id=video_id,
-                         session_id=entry.get("session_id", ""),
-                         title=title, code=code, event=event)
-        xbmcplugin.addDirectoryItem(ADDON_HANDLE, url, li, isFolder=False)
+        url = _play_url(video_id, entry.get("session_id", ""), title, code,
+                        event)
+        listing.append((url, li, False))
 
+    xbmcplugin.addDirectoryItems(ADDON_HANDLE, listing, len(listing))
     xbmcplugin.endOfDirectory(ADDON_HANDLE)
 
 
 def clear_history():
-    if xbmcgui.Dialog().yesno("Cisco Live", "Clear all watch history?"):
-        history.clear()
-        xbmcgui.Dialog().notification(
-            "Cisco Live", "History cleared", xbmcgui.NOTIFICATION_INFO)
-    xbmc.executebuiltin("Container.Refresh")
+    from resources.lib import history
+
+    if not xbmcgui.Dialog().yesno("Cisco Live", "Clear all watch history?"):
+        # Stay on the history listing
+        xbmcplugin.endOfDirectory(ADDON_HANDLE, succeeded=False)
+        return
+    history.clear()
+    xbmcgui.Dialog().notification(
+        "Cisco Live", "History cleared", xbmcgui.NOTIFICATION_INFO)
+    # The history is now known to be empty: replace the listing in place
+    # instead of refreshing, which would relaunch the plugin to re-read it
+    xbmcplugin.setContent(ADDON_HANDLE, "videos")
+    xbmcplugin.endOfDirectory(ADDON_HANDLE, updateListing=True)
+
+
+def clear_cache():
+    # Launched from the settings dialog via RunPlugin: there is no listing
+    # to end, just confirm and report
+    if not xbmcgui.Dialog().yesno("Cisco Live", "Clear all cached catalog data?"):
+        return
+    rainfocus.clear_cache()
+    xbmcgui.Dialog().notification(
+        "Cisco Live", "Cache cleared", xbmcgui.NOTIFICATION_INFO)
 
 
 # ---------------------------------------------------------------------------
 # Session Info
 # ---------------------------------------------------------------------------
 
+_INFO_TEMPLATE = "\n".join([
+    "[B]{title}[/B]",
+    "",
+    "Event: {event}",
+    "Session: {code}",
+    "Type: {session_type}",
+    "Level: {level}",
+    "Speaker(s): {speakers}",
+    "",
+    "{abstract}",
+])
+
+
 def show_info(session_id):
     item = rainfocus.get_session(session_id)
     if not item:
         xbmcgui.Dialog().notification(
             "Cisco Live", "Session not found", xbmcgui.NOTIFICATION_WARNING)
         return
-    lines = [
-        "[B]{}[/B]".format(item.get("title", "")),
-        "",
-        "Event: {}".format(item.get("event", "N/A")),
-        "Session: {}".format(item.get("code", "N/A")),
-        "Type: {}".format(item.get("session_type", "N/A")),
-        "Level: {}".format(item.get("level", "N/A")),
-        "Speaker(s): {}".format(", ".join(item.get("speakers", [])) or "N/A"),
-        "",
-        item.get("abstract", "No description available."),
-    ]
-    xbmcgui.Dialog().textviewer(
-        item.get("code", "Session Info"), "\n".join(lines))
+    text = _INFO_TEMPLATE.format(
+        title=item.get("title", ""),
+        event=item.get("event", "N/A"),
+        code=item.get("code", "N/A"),
+        session_type=item.get("session_type", "N/A"),
+        level=item.get("level", "N/A"),
+        speakers=", ".join(item.get("speakers", [])) or "N/A",
+        abstract=item.get("abstract", "No description available."),
+    )
+    xbmcgui.Dialog().textviewer(item.get("code", "Session Info"), text)
 
 
 # ---------------------------------------------------------------------------
 # About
 # ---------------------------------------------------------------------------
 
+_ABOUT_TEMPLATE = "\n".join([
+    "[B]Cisco Live On-Demand[/B]",
+    "Version {version}",
+    "",
+    "Browse and stream 14,000+ Cisco Live technical sessions",
+    "from events spanning 2018-2026.",
+    "",
+    "All videos are freely accessible without authentication.",
+    "",
+    "[B]Features:[/B]",
+    "• Browse by event, technology, and technical level",
+    "• Search across all sessions",
+    "• Multi-select filtering",
+    "• Watch history tracking",
+    "• Direct Brightcove streaming",
+    "",
+    "[B]Source:[/B]",
+    "github.com/martap79/plugin.video.ciscolive",
+    "",
+    "[B]Website:[/B]",
+    "ciscolive.com/on-demand",
+])
+
+
 def show_about():
     """Show plugin information."""
-    version = ADDON.getAddonInfo("version")
-    lines = [
-        "[B]Cisco Live On-Demand[/B]",
-        "Version {}".format(version),
-        "",
-        "Browse and stream 14,000+ Cisco Live technical sessions",
-        "from events spanning 2018-2026.",
-        "",
-        "All videos are freely accessible without authentication.",
-        "",
-        "[B]Features:[/B]",
-        "• Browse by event, technology, and technical level",
-        "• Search across all sessions",
-        "• Multi-select filtering",
-        "• Watch history tracking",
-        "• Direct Brightcove streaming",
-        "",
-        "[B]Source:[/B]",
-        "github.com/martap79/plugin.video.ciscolive",
-        "",
-        "[B]Website:[/B]",
-        "ciscolive.com/on-demand",
-    ]
-    xbmcgui.Dialog().textviewer("About Cisco Live On-Demand", "\n".join(lines))
+    xbmcgui.Dialog().textviewer(
+        "About Cisco Live On-Demand",
+        _ABOUT_TEMPLATE.format(version=ADDON.getAddonInfo("version")))
 
 
 # ---------------------------------------------------------------------------
 # Router
 # ---------------------------------------------------------------------------
 
-def router():
-    params = get_params()
-    action = params.get("action", "")
-
-    if action == "":
-        main_menu()
-    elif action == "new_releases":
-        show_new_releases()
-    elif action == "events":
-        show_events()
-    elif action == "event_section":
-        show_event_section(
-            section_id=params.get("section_id", ""),
-            event_name=params.get("event_name", ""),
-            page=int(params.get("page", "0")),
-            tech_filter=params.get("tech_filter", ""),
-            level_filter=params.get("level_filter", ""),
-            keyword=params.get("keyword", ""),
-        )
-    elif action == "event_filter_pick":
-        _event_filter_pick(
-            filter_type=params.get("filter_type", ""),
-            section_id=params.get("section_id", ""),
-            event_name=params.get("event_name", ""),
-            tech_filter=params.get("tech_filter", ""),
-            level_filter=params.get("level_filter", ""),
-            keyword=params.get("keyword", ""),
-        )
-    elif action == "event_keyword_search":
-        _event_keyword_search(
-            section_id=params.get("section_id", ""),
-            event_name=params.get("event_name", ""),
-            tech_filter=params.get("tech_filter", ""),
-            level_filter=params.get("level_filter", ""),
-            keyword=params.get("keyword", ""),
-        )
-    elif action == "technologies":
-        show_technologies()
-    elif action == "levels":
-        show_levels()
-    elif action == "session_types":
-        show_session_types()
-    elif action == "categories":
-        show_categories()
-    elif action == "search":
-        do_search()
-    elif action == "search_in":
-        do_search(filter_key=params.get("filter_key"),
-                  filter_val=params.get("filter_val"),
-                  filter_label=params.get("filter_label"))
-    elif action == "refine":
-        do_refine(filter_key=params.get("filter_key"),
-                  filter_val=params.get("filter_val"),
-                  filter_label=params.get("filter_label"),
-                  search_text=params.get("search_text"))
-    elif action == "sort":
-        do_sort(filter_key=params.get("filter_key"),
-                filter_val=params.get("filter_val"),
-                filter_label=params.get("filter_label"),
-                search_text=params.get("search_text"),
-                extra_filters=params.get("extra_filters"))
-    elif action == "about":
-        show_about()
-    elif action == "history":
-        show_history()
-    elif action == "clear_history":
-        clear_history()
-    elif action == "list":
-        show_session_list(
-            page=int(params.get("page", "0")),
-            filter_key=params.get("filter_key"),
+def _dispatch_event_section(params):
+    show_event_section(
+        section_id=params.get("section_id", ""),
+        event_name=params.get("event_name", ""),
+        page=int(params.get("page", "0")),
+        tech_filter=params.get("tech_filter", ""),
+        level_filter=params.get("level_filter", ""),
+        keyword=params.get("keyword", ""),
+    )
+
+
+def _dispatch_event_filter_pick(params):
+    _event_filter_pick(
+        filter_type=params.get("filter_type", ""),
+        section_id=params.get("section_id", ""),
+        event_name=params.get("event_name", ""),
+        tech_filter=params.get("tech_filter", ""),
+        level_filter=params.get("level_filter", ""),
+        keyword=params.get("keyword", ""),
+    )
+
+
+def _dispatch_event_keyword_search(params):
+    _event_keyword_search(
+        section_id=params.get("section_id", ""),
+        event_name=params.get("event_name", ""),
+        tech_filter=params.get("tech_filter", ""),
+        level_filter=params.get("level_filter", ""),
+        keyword=params.get("keyword", ""),
+    )
+
+
+def _dispatch_search_in(params):
+    do_search(filter_key=params.get("filter_key"),
+              filter_val=params.get("filter_val"),
+              filter_label=params.get("filter_label"))
+
+
+def _dispatch_refine(params):
+    do_refine(filter_key=params.get("filter_key"),
+              filter_val=params.get("filter_val"),
+              filter_label=params.get("filter_label"),
+              search_text=params.get("search_text"))
+
+
+def _dispatch_sort(params):
+    do_sort(filter_key=params.get("filter_key"),
             filter_val=params.get("filter_val"),
             filter_label=params.get("filter_label"),
             search_text=params.get("search_text"),
-            extra_filters=params.get("extra_filters"),
-            sort_by=params.get("sort_by", "default"),
-            event_name=params.get("event_name"),
-            catalog=params.get("catalog"),
-        )
-    elif action == "play":
-        play_video(
-            params.get("video_id", ""),
-            params.get("title", ""),
-            params.get("session_id", ""),
-            params.get("code", ""),
-            params.get("event", ""),
-        )
-    elif action == "info":
-        show_info(params.get("session_id", ""))
-    else:
-        main_menu()
+            extra_filters=params.get("extra_filters"))
+
+
+def _dispatch_list(params):
+    show_session_list(
+        page=int(params.get("page", "0")),
+        filter_key=params.get("filter_key"),
+        filter_val=params.get("filter_val"),
+        filter_label=params.get("filter_label"),
+        search_text=params.get("search_text"),
+        extra_filters=params.get("extra_filters"),
+        sort_by=params.get("sort_by", "default"),
+        event_name=params.get("event_name"),
+        catalog=params.get("catalog"),
+    )
+
+
+def _dispatch_play(params):
+    play_video(
+        params.get("video_id", ""),
+        params.get("title", ""),
+        params.get("session_id", ""),
+        params.get("code", ""),
+        params.get("event", ""),
+    )
+
+
+# Action name -> handler(params); built once at import
+HANDLERS = {
+    "": lambda p: main_menu(),
+    "new_releases": lambda p: show_new_releases(),
+    "events": lambda p: show_events(),
+    "event_section": _dispatch_event_section,
+    "event_filter_pick": _dispatch_event_filter_pick,
+    "event_keyword_search": _dispatch_event_keyword_search,
+    "technologies": lambda p: show_technologies(),
+    "levels": lambda p: show_levels(),
+    "session_types": lambda p: show_session_types(),
+    "categories": lambda p: show_categories(),
+    "search": lambda p: do_search(),
+    "search_in": _dispatch_search_in,
+    "refine": _dispatch_refine,
+    "sort": _dispatch_sort,
+    "about": lambda p: show_about(),
+    "history": lambda p: show_history(),
+    "clear_history": lambda p: clear_history(),
+    "clear_cache": lambda p: clear_cache(),
+    "list": _dispatch_list,
+    "play": _dispatch_play,
+    "info": lambda p: show_info(p.get("session_id", "")),
+}
+
+
+def router():
+    # Opening the addon root is the most common launch: skip param parsing
+    if ADDON_ARGS in ("", "?"):
+        return main_menu()
+    params = get_params()
+    handler = HANDLERS.get(params.get("action", ""), HANDLERS[""])
+    handler(params)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+"""
+Shared keep-alive HTTP connections for the RainFocus and Brightcove clients.
+
+Each thread keeps one persistent connection per (scheme, host), so repeated
+requests within a plugin invocation skip the TCP/TLS handshake. Threads get
+their own connections because http.client connections are not thread-safe
+(the next-page prefetch runs on a background thread).
+"""
+
+import collections
+import socket
+import threading
+import time
+
+try:
+    import http.client as httplib
+    from urllib.parse import urlsplit
+except ImportError:
+    import httplib
+    from urlparse import urlsplit
+
+DEFAULT_TIMEOUT = 15
+# Establishing the connection (TCP + TLS) gets a shorter budget than
+# waiting for a response, so an unreachable host fails fast
+CONNECT_TIMEOUT = 5
+
+# Gateway errors from the CDN in front of the APIs are usually transient;
+# retry them up to RETRIES times, sleeping BACKOFF * 2**n seconds between
+RETRY_STATUSES = (502, 503, 504)
+RETRIES = 2
+BACKOFF = 0.3
+
+# status: int; headers: message with .get(); body: bytes, or None for
+# error statuses (>= 400), whose bodies are never read
+Response = collections.namedtuple("Response", ["status", "headers", "body"])
+
+_local = threading.local()
+
+
+def _pool():
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = {}
+    return pool
+
+
+def _connection(scheme, host, timeout, connect_timeout):
+    pool = _pool()
+    conn = pool.get((scheme, host))
+    if conn is None:
+        if scheme == "https":
+            conn = httplib.HTTPSConnection(host, timeout=connect_timeout)
+        else:
+            conn = httplib.HTTPConnection(host, timeout=connect_timeout)
+        pool[(scheme, host)] = conn
+    if conn.sock is None:
+        conn.timeout = connect_timeout
+        conn.connect()
+    conn.timeout = timeout
+    conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop(scheme, host):
+    conn = _pool().pop((scheme, host), None)
+    if conn is not None:
+        conn.close()
+
+
+def decoded_body(resp):
+    """Return resp.body, gunzipped if the server declared gzip encoding.
+
+    Servers may ignore Accept-Encoding, so only what is labelled gzip is
+    decompressed.
+    """
+    if resp.headers.get("Content-Encoding", "").lower() == "gzip":
+        import gzip
+        return gzip.decompress(resp.body)
+    return resp.body
+
+
+def request(method, url, body=None, headers=None, timeout=DEFAULT_TIMEOUT,
+            retries=RETRIES, connect_timeout=CONNECT_TIMEOUT):
+    """Send a request over the calling thread's pooled connection.
+
+    `connect_timeout` bounds opening a new connection, `timeout` each read
+    after that. Redirects are not followed. Gateway errors (RETRY_STATUSES)
+    are retried up to `retries` times with exponential backoff. Returns a
+    Response, or None on network failure.
+    """
+    parts = urlsplit(url)
+    scheme, host = parts.scheme, parts.netloc
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    for attempt in range(retries + 1):
+        resp = _send(scheme, host, method, path, body, headers, timeout,
+                     connect_timeout)
+        if (resp is None or resp.status not in RETRY_STATUSES
+                or attempt == retries):
+            return resp
+        time.sleep(BACKOFF * (2 ** attempt))
+    return None
+
+
+def _send(scheme, host, method, path, body, headers, timeout,
+          connect_timeout):
+    # A reused connection may have been closed by the server while idle;
+    # retry once on a fresh one, but never after a timeout
+    for attempt in (0, 1):
+        try:
+            conn = _connection(scheme, host, timeout, connect_timeout)
+            conn.request(method, path, body=body, headers=headers or {})
+            resp = conn.getresponse()
+            if resp.status >= 400:
+                # Don't pull an error page into memory only to discard it;
+                # closing the connection is cheaper than draining it
+                _drop(scheme, host)
+                return Response(resp.status, resp.msg, None)
+            data = resp.read()
+        except (httplib.HTTPException, OSError) as e:
+            _drop(scheme, host)
+            if attempt or isinstance(e, socket.timeout):
+                return None
+            continue
+        return Response(resp.status, resp.msg, data)
+    return None
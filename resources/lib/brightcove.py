@@ -5,15 +5,13 @@ Resolves a Brightcove video ID to a playable HLS/MP4 stream URL
 using the Brightcove Playback API (edge.api.brightcove.com).
 """
 
+import collections
 import json
+import re
 import threading
+from operator import attrgetter
 
-try:
-    from urllib.request import Request, urlopen
-    from urllib.error import HTTPError
-except ImportError:
-    from urllib2 import Request, urlopen, HTTPError
-
+from . import _http
 from . import rainfocus
 
 # Brightcove Playback API
@@ -24,60 +22,161 @@ PLAYBACK_API = (
 _POLICY_KEY = None
 _POLICY_LOCK = threading.Lock()
 
+# A playable source from the playback API; type is "hls", "dash" or "mp4"
+Stream = collections.namedtuple(
+    "Stream", ["url", "type", "width", "height", "bitrate", "codec"])
+
+MIME_TYPES = {
+    "hls": "application/vnd.apple.mpegurl",
+    "mp4": "video/mp4",
+    "dash": "application/dash+xml",
+}
+
+# Stream type preference for best_stream (lower wins)
+_TYPE_RANK_HLS = {"hls": 0, "mp4": 1, "dash": 2}
+_TYPE_RANK_MP4 = {"mp4": 0, "dash": 1, "hls": 2}
+
+# The policy key changes rarely; cache it (with the config.json ETag) per
+# account/player so a player change invalidates it
+POLICY_KEY_TTL = 7 * 86400
+_POLICY_CACHE_KEY = "bc_policy:{}:{}".format(rainfocus.BRIGHTCOVE_ACCOUNT,
+                                             rainfocus.BRIGHTCOVE_PLAYER)
+# An expired entry is kept this long for ETag revalidation
+_POLICY_STALE_TTL = 365 * 86400
+# Set while config.json has recently failed to yield a key
+_CONFIG_FAILED_KEY = "bc_config_failed:{}:{}".format(
+    rainfocus.BRIGHTCOVE_ACCOUNT, rainfocus.BRIGHTCOVE_PLAYER)
+
+# policyKey assignment inside the minified player JS (config.json fallback)
+_POLICY_KEY_RE = re.compile(r'policyKey\s*:\s*["\']([^"\']+)')
 
-def _fetch_policy_key():
+
+def _get_body(url, headers=None):
+    """GET url asking for gzip; return (response, decoded body or None)."""
+    req_headers = {"Accept-Encoding": "gzip"}
+    if headers:
+        req_headers.update(headers)
+    resp = _http.request("GET", url, headers=req_headers)
+    if resp is None or resp.status != 200:
+        return resp, None
+    return resp, _http.decoded_body(resp)
+
+
+def _fetch_policy_key(refresh=False):
     """
     Fetch the Brightcove policy key from the player config.json endpoint.
     The key lives at video_cloud.policy_key in the player configuration.
     Response may be gzip-encoded.
+
+    The key is kept in the on-disk cache for POLICY_KEY_TTL, so a fresh
+    plugin process can resolve a video with a single request; once it
+    expires, config.json is revalidated with its ETag. refresh=True skips
+    both caches (used when the playback API rejects the key).
     """
     global _POLICY_KEY
     with _POLICY_LOCK:
-        if _POLICY_KEY:
+        if _POLICY_KEY and not refresh:
             return _POLICY_KEY
+        stale = None
+        if not refresh:
+            entry = rainfocus.cache_get(_POLICY_CACHE_KEY, POLICY_KEY_TTL)
+            if isinstance(entry, dict):
+                _POLICY_KEY = entry["key"]
+                return _POLICY_KEY
+            stale = rainfocus.cache_get(_POLICY_CACHE_KEY, _POLICY_STALE_TTL)
+            if not isinstance(stale, dict):
+                stale = None
+
+        if rainfocus.cache_get(_CONFIG_FAILED_KEY, POLICY_KEY_TTL):
+            # config.json has failed recently: race it against the JS
+            # fallback instead of waiting for both in turn
+            def _from_config():
+                entry = _policy_key_from_config(stale)
+                if entry:
+                    # It is back: go sequential again on later refreshes
+                    rainfocus.cache_delete(_CONFIG_FAILED_KEY)
+                return entry
+
+            entry = _first_result(_from_config, _policy_key_from_js)
+        else:
+            entry = _policy_key_from_config(stale)
+            if not entry:
+                rainfocus.cache_set(_CONFIG_FAILED_KEY, True)
+                entry = _policy_key_from_js()
+        if not entry:
+            return None
+        # Re-saving a revalidated entry restarts its TTL
+        _POLICY_KEY = entry["key"]
+        rainfocus.cache_set(_POLICY_CACHE_KEY, entry)
+        return _POLICY_KEY
+
+
+def _first_result(*fns):
+    """Run fns concurrently and return the first truthy result, or None.
+
+    The executor is not waited on, so a slower loser finishes in the
+    background (bounded by the HTTP timeout).
+    """
+    # Only needed on the rare race path; keep it off the playback import
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    ex = ThreadPoolExecutor(max_workers=len(fns))
+    try:
+        futures = [ex.submit(fn) for fn in fns]
+        for f in as_completed(futures, timeout=_http.DEFAULT_TIMEOUT + 5):
+            result = f.result()
+            if result:
+                return result
+    except Exception:
+        pass
+    finally:
+        ex.shutdown(wait=False)
+    return None
+
 
-        import gzip
-
-        config_url = (
-            "https://players.brightcove.net/{account}/{player}_default/config.json"
-        ).format(account=rainfocus.BRIGHTCOVE_ACCOUNT, player=rainfocus.BRIGHTCOVE_PLAYER)
-        try:
-            req = Request(config_url, headers={"Accept-Encoding": "gzip"})
-            resp = urlopen(req, timeout=15)
-            raw = resp.read()
-            try:
-                data = gzip.decompress(raw)
-            except (OSError, IOError):
-                data = raw  # Response wasn't gzip-encoded despite header
+def _policy_key_from_config(stale=None):
+    """Return a {"key", "etag"} cache entry from config.json, or None.
+
+    With a stale entry, the request is conditional and a 304 returns it.
+    """
+    config_url = (
+        "https://players.brightcove.net/{account}/{player}_default/config.json"
+    ).format(account=rainfocus.BRIGHTCOVE_ACCOUNT, player=rainfocus.BRIGHTCOVE_PLAYER)
+    headers = None
+    if stale and stale.get("etag"):
+        headers = {"If-None-Match": stale["etag"]}
+    try:
+        resp, data = _get_body(config_url, headers)
+        if resp is not None and resp.status == 304 and headers:
+            return stale
+        if data:
             config = json.loads(data)
             pk = config.get("video_cloud", {}).get("policy_key")
             if pk:
-                _POLICY_KEY = pk
-                return _POLICY_KEY
-        except Exception:
-            pass
-
-        # Fallback: try parsing the player JS for policyKey
-        import re
-        js_url = (
-            "https://players.brightcove.net/{account}/{player}_default/index.min.js"
-        ).format(account=rainfocus.BRIGHTCOVE_ACCOUNT, player=rainfocus.BRIGHTCOVE_PLAYER)
-        try:
-            req = Request(js_url, headers={"Accept-Encoding": "gzip"})
-            resp = urlopen(req, timeout=15)
-            raw = resp.read()
-            try:
-                js = gzip.decompress(raw).decode("utf-8", errors="replace")
-            except (OSError, IOError):
-                js = raw.decode("utf-8", errors="replace")
-            m = re.search(r'policyKey\s*:\s*["\']([^"\']+)', js)
+                return {"key": pk, "etag": resp.headers.get("ETag")}
+    except Exception:
+        pass
+    return None
+
+
+def _policy_key_from_js():
+    """Fallback: try parsing the player JS for policyKey."""
+    js_url = (
+        "https://players.brightcove.net/{account}/{player}_default/index.min.js"
+    ).format(account=rainfocus.BRIGHTCOVE_ACCOUNT, player=rainfocus.BRIGHTCOVE_PLAYER)
+    try:
+        _, data = _get_body(js_url)
+        if data:
+            m = _POLICY_KEY_RE.search(data.decode("utf-8", errors="replace"))
             if m:
-                _POLICY_KEY = m.group(1)
-                return _POLICY_KEY
-        except Exception:
-            pass
+                return {"key": m.group(1), "etag": None}
+    except Exception:
+        pass
+    return None
 
-        return None
+
+def _playback_headers(policy_key):
+    return {"Accept": "application/json;pk={}".format(policy_key)}
 
 
 def resolve(video_id):
@@ -86,7 +185,7 @@ def resolve(video_id):
 
     Returns:
         dict with keys:
-            - streams: list of {url, width, height, bitrate, codec} sorted by bitrate desc
+            - streams: list of Stream tuples sorted by bitrate desc
             - thumbnail: str (poster image URL)
             - title: str
             - duration: float (seconds)
@@ -99,55 +198,42 @@ def resolve(video_id):
     url = PLAYBACK_API.format(
         account=rainfocus.BRIGHTCOVE_ACCOUNT, video_id=video_id
     )
-    headers = {
-        "Accept": "application/json;pk={}".format(policy_key),
-    }
-    req = Request(url, headers=headers)
-    try:
-        resp = urlopen(req, timeout=15)
-        data = json.loads(resp.read().decode("utf-8"))
-    except HTTPError:
+    resp = _http.request("GET", url, headers=_playback_headers(policy_key))
+    if resp is not None and resp.status in (401, 403):
+        # The cached key may have been rotated: fetch a fresh one once
+        policy_key = _fetch_policy_key(refresh=True)
+        if not policy_key:
+            return None
+        resp = _http.request("GET", url, headers=_playback_headers(policy_key))
+    if resp is None or resp.status != 200:
         return None
+    data = json.loads(resp.body)
 
     streams = []
     for source in data.get("sources", []):
         src_url = source.get("src", "")
-        src_type = source.get("type", "").lower()
         if not src_url:
             continue
+        src_type = source.get("type", "").lower()
         # HLS: type contains mpegurl or m3u8, or URL ends with .m3u8
         if "mpegurl" in src_type or "m3u8" in src_type or ".m3u8" in src_url:
-            streams.append({
-                "url": src_url,
-                "type": "hls",
-                "width": source.get("width", 0),
-                "height": source.get("height", 0),
-                "bitrate": source.get("avg_bitrate", 0),
-                "codec": source.get("codec", ""),
-            })
+            kind = "hls"
         # DASH: type contains dash+xml
         elif "dash" in src_type:
-            streams.append({
-                "url": src_url,
-                "type": "dash",
-                "width": source.get("width", 0),
-                "height": source.get("height", 0),
-                "bitrate": source.get("avg_bitrate", 0),
-                "codec": source.get("codec", ""),
-            })
+            kind = "dash"
         # MP4: type contains mp4, or URL contains /pmp4/ or ends with .mp4
         elif "mp4" in src_type or "/pmp4/" in src_url or src_url.endswith(".mp4"):
-            streams.append({
-                "url": src_url,
-                "type": "mp4",
-                "width": source.get("width", 0),
-                "height": source.get("height", 0),
-                "bitrate": source.get("avg_bitrate", 0),
-                "codec": source.get("codec", ""),
-            })
+            kind = "mp4"
+        else:
+            continue
+        streams.append(Stream(src_url, kind,
+                              source.get("width", 0),
+                              source.get("height", 0),
+                              source.get("avg_bitrate") or 0,
+                              source.get("codec", "")))
 
     # Sort by bitrate descending (highest quality first)
-    streams.sort(key=lambda s: s.get("bitrate", 0), reverse=True)
+    streams.sort(key=attrgetter("bitrate"), reverse=True)
 
     poster = data.get("poster", "")
     thumbnail = data.get("thumbnail", poster)
@@ -175,25 +261,8 @@ def best_stream(video_id, prefer_hls=True):
     if not info or not info["streams"]:
         return None, None
 
-    def prefer_https(stream_list):
-        """Sort streams to prefer HTTPS over HTTP."""
-        return sorted(stream_list, key=lambda s: (0 if s["url"].startswith("https") else 1))
-
-    if prefer_hls:
-        hls = prefer_https([s for s in info["streams"] if s["type"] == "hls"])
-        if hls:
-            return hls[0]["url"], "application/vnd.apple.mpegurl"
-
-    mp4 = prefer_https([s for s in info["streams"] if s["type"] == "mp4"])
-    if mp4:
-        return mp4[0]["url"], "video/mp4"
-
-    # DASH fallback
-    dash = prefer_https([s for s in info["streams"] if s["type"] == "dash"])
-    if dash:
-        return dash[0]["url"], "application/dash+xml"
-
-    # Last resort: first available
-    s = info["streams"][0]
-    type_map = {"hls": "application/vnd.apple.mpegurl", "mp4": "video/mp4", "dash": "application/dash+xml"}
-    return s["url"], type_map.get(s["type"], "video/mp4")
+    # Preferred type first, then HTTPS, then the highest bitrate
+    type_rank = _TYPE_RANK_HLS if prefer_hls else _TYPE_RANK_MP4
+    chosen = min(info["streams"], key=lambda s: (
+        type_rank[s.type], not s.url.startswith("https"), -s.bitrate))
+    return chosen.url, MIME_TYPES[chosen.type]
@@ -1,13 +1,18 @@
 """
 Watch history tracking for Cisco Live Kodi plugin.
 
-Stores recently played sessions locally in the addon profile directory.
+Stores recently played sessions locally in the addon profile directory
+as JSON Lines, newest first, so a listing parses only the entries it shows.
 Max 100 entries, auto-prunes oldest when exceeded.
 """
 
 import json
 import os
+import tempfile
+import threading
 import time
+from collections import OrderedDict
+from itertools import islice
 
 try:
     import xbmcaddon
@@ -17,39 +22,109 @@ try:
 except Exception:
     HISTORY_DIR = os.path.join(os.path.dirname(__file__), ".profile")
 
-HISTORY_FILE = os.path.join(HISTORY_DIR, "history.json")
+HISTORY_FILE = os.path.join(HISTORY_DIR, "history.jsonl")
+LEGACY_HISTORY_FILE = os.path.join(HISTORY_DIR, "history.json")
 MAX_ENTRIES = 100
 
 
-def _load():
-    """Load history from disk."""
-    if not os.path.exists(HISTORY_FILE):
-        return []
+# Parsed history for this process, newest first: session_id -> entry
+_entries = None
+
+
+def _read(limit=None):
+    """Parse up to limit entries from disk, newest first."""
     try:
         with open(HISTORY_FILE, "r") as f:
-            return json.load(f)
+            return [json.loads(line) for line in islice(f, limit)
+                    if line.strip()]
+    except (IOError, OSError):
+        pass
     except Exception:
         return []
+    return _migrate_legacy()[:limit]
 
 
-def _save(entries):
-    """Save history to disk."""
-    os.makedirs(HISTORY_DIR, exist_ok=True)
+def _migrate_legacy():
+    """Convert a pre-JSONL history.json, if any, and return its entries."""
     try:
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(entries, f, indent=2)
+        with open(LEGACY_HISTORY_FILE, "r") as f:
+            entries = json.load(f)
     except Exception:
+        return []
+    _save(entries)
+    try:
+        os.remove(LEGACY_HISTORY_FILE)
+    except OSError:
         pass
+    return entries
+
+
+def _load():
+    """Load the full history from disk (once per process)."""
+    global _entries
+    if _entries is None:
+        _entries = OrderedDict((e.get("session_id"), e) for e in _read())
+    return _entries
+
+
+def _save(entries):
+    """Save a list of entries to disk atomically."""
+    # A unique temp file, so two plugin processes saving at once cannot
+    # interleave their writes before the rename
+    tmp = None
+    try:
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=HISTORY_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")))
+                f.write("\n")
+        os.replace(tmp, HISTORY_FILE)
+        tmp = None
+    except Exception:
+        if tmp:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+# Saves run on a background writer so the play path never waits on the
+# profile disk. Only the newest snapshot is kept, so bursts coalesce into
+# one write. The thread is non-daemon: the interpreter waits for it before
+# Kodi tears the plugin process down.
+_write_lock = threading.Lock()
+_pending = None
+_writer = None
+
+
+def _writer_loop():
+    global _pending, _writer
+    while True:
+        with _write_lock:
+            snapshot, _pending = _pending, None
+            if snapshot is None:
+                _writer = None
+                return
+        _save(snapshot)
+
+
+def _save_async(entries):
+    global _pending, _writer
+    with _write_lock:
+        _pending = list(entries.values())
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop)
+            _writer.start()
 
 
 def add(session_id, title="", video_id="", code="", event=""):
     """Record that a session was played."""
     entries = _load()
 
-    # Remove existing entry for this session (we'll re-add at top)
-    entries = [e for e in entries if e.get("session_id") != session_id]
-
-    entry = {
+    # Drop any existing entry for this session and re-add it at the top
+    entries.pop(session_id, None)
+    entries[session_id] = {
         "session_id": session_id,
         "title": title,
         "video_id": video_id,
@@ -57,19 +132,23 @@ def add(session_id, title="", video_id="", code="", event=""):
         "event": event,
         "timestamp": time.time(),
     }
-    entries.insert(0, entry)
+    entries.move_to_end(session_id, last=False)
 
     # Prune to max size
-    entries = entries[:MAX_ENTRIES]
-    _save(entries)
+    while len(entries) > MAX_ENTRIES:
+        entries.popitem(last=True)
+    _save_async(entries)
 
 
 def get_recent(limit=50):
     """Get recently played sessions, newest first."""
-    entries = _load()
-    return entries[:limit]
+    if _entries is not None:
+        return list(islice(_entries.values(), limit))
+    return _read(limit)
 
 
 def clear():
     """Clear all watch history."""
-    _save([])
+    global _entries
+    _entries = OrderedDict()
+    _save_async(_entries)
@@ -11,19 +11,35 @@ API limits:
 - Filtered searches (by event/tech/level) paginate within their result set
 """
 
+import collections
 import json
 import time
 import hashlib
 import os
+import tempfile
+import threading
 
 try:
-    from urllib.request import Request, urlopen
     from urllib.parse import urlencode
-    from urllib.error import HTTPError, URLError
 except ImportError:
-    from urllib2 import Request, urlopen, HTTPError, URLError
     from urllib import urlencode
 
+# orjson is several times faster on the large search responses; use it
+# where it is installed (both loads() accept bytes)
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+from . import _http
+
 # Cache directory inside Kodi userdata
 try:
     import xbmcaddon
@@ -35,6 +51,16 @@ try:
 except Exception:
     CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")
 
+# Cache TTLs in seconds. Search pages follow the user's "Cache duration"
+# setting; the event list and individual sessions change far less often.
+CACHE_TTL = 21600  # 6 hours (content doesn't change frequently)
+try:
+    CACHE_TTL = _ADDON.getSettingInt("cache_hours") * 3600 or CACHE_TTL
+except Exception:
+    pass
+EVENTS_CACHE_TTL = 86400  # 24 hours
+SESSION_CACHE_TTL = 30 * 86400  # 30 days
+
 
 API_URL = "https://events.rainfocus.com/api/{endpoint}"
 
@@ -53,14 +79,35 @@ HEADERS = {
     "rfApiProfileId": API_PROFILE_ID,
     "rfWidgetId": WIDGET_ID,
     "Content-Type": "application/x-www-form-urlencoded",
+    "Accept-Encoding": "gzip",
+}
+
+# Request headers per catalog profile, built once (http.client does not
+# mutate the dict it is given)
+_PROFILE_HEADERS = {
+    pid: dict(HEADERS, rfApiProfileId=pid)
+    for pid in (LEGACY_PROFILE_ID, CURRENT_PROFILE_ID)
 }
 
 # Pagination limits enforced by RainFocus
 PAGE_SIZE = 50
 MAX_RESULTS = 500  # paginationMax
 
-# Cache TTL in seconds
-CACHE_TTL = 21600  # 6 hours (content doesn't change frequently)
+# How many pages past the one just shown to fetch in the background, and
+# how many of the newest events get their first page warmed when the event
+# list is shown
+PREFETCH_PAGES = 1
+PREFETCH_EVENTS = 3
+
+# Upper bound for the on-disk cache. Once reached, new entries are kept in
+# memory only until the user clears the cache from the addon settings.
+CACHE_LIMIT_BYTES = 128 * 1024 * 1024
+
+_EVENTS_CACHE_KEY = "event_sections"
+_CURRENT_EVENTS_CACHE_KEY = "event_sections:current"
+
+# Bump when the shape of cached payloads changes so stale entries are ignored
+CACHE_VERSION = 3
 
 # Known events across both catalogs, sorted newest first
 # Current catalog (CURRENT_PROFILE_ID) has 2022+ events
@@ -142,46 +189,356 @@ SESSION_TYPES = [
 ]
 
 
-def _cache_path(key):
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    h = hashlib.md5(key.encode()).hexdigest()
-    return os.path.join(CACHE_DIR, h + ".json")
+_CACHE_DIR_READY = False
+
+
+def _cache_path(key, ext=".json"):
+    h = hashlib.blake2b("{}:{}".format(CACHE_VERSION, key).encode("utf-8"),
+                        digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, h + ext)
+
 
+def _ensure_cache_dir():
+    # Only writers need the directory, and only the first one pays the stat
+    global _CACHE_DIR_READY
+    if not _CACHE_DIR_READY:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _CACHE_DIR_READY = True
 
-def _cache_get(key):
+
+# In-process L1 in front of the disk cache: key -> (timestamp, payload).
+# Shared with the prefetch workers, hence the lock.
+_MEM_CACHE = collections.OrderedDict()
+_MEM_MAX = 64
+_mem_lock = threading.Lock()
+
+
+def _mem_put(key, ts, payload):
+    with _mem_lock:
+        _MEM_CACHE[key] = (ts, payload)
+        _MEM_CACHE.move_to_end(key)
+        if len(_MEM_CACHE) > _MEM_MAX:
+            _MEM_CACHE.popitem(last=False)
+
+
+# Running total of bytes in CACHE_DIR, summed from the directory on the
+# first write of the process. Prefetch workers write too, so it is only
+# read or updated under _size_lock.
+_cache_bytes = None
+_size_lock = threading.Lock()
+
+
+def _cache_size():
+    # Caller holds _size_lock
+    global _cache_bytes
+    if _cache_bytes is None:
+        total = 0
+        try:
+            for entry in os.scandir(CACHE_DIR):
+                if entry.name.endswith(".json"):
+                    total += entry.stat().st_size
+        except OSError:
+            pass
+        _cache_bytes = total
+    return _cache_bytes
+
+
+def _cache_get(key, ttl=None):
+    """Return the cached payload for key, or None if missing or older than
+    ttl seconds (CACHE_TTL by default)."""
+    ttl = ttl or CACHE_TTL
+    with _mem_lock:
+        hit = _MEM_CACHE.get(key)
+        if hit is not None:
+            _MEM_CACHE.move_to_end(key)
+    if hit is not None and time.time() - hit[0] <= ttl:
+        return hit[1]
     path = _cache_path(key)
-    if not os.path.exists(path):
-        return None
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-        if time.time() - data.get("_ts", 0) > CACHE_TTL:
+        # The file's mtime is its write time: expired entries are rejected
+        # from one stat() without being read or parsed
+        mtime = os.stat(path).st_mtime
+        if time.time() - mtime > ttl:
             return None
-        return data.get("payload")
+        with open(path, "rb") as f:
+            payload = _json_loads(f.read())
+        _mem_put(key, mtime, payload)
+        return payload
     except Exception:
         return None
 
 
-def _cache_set(key, payload):
+def _cache_set(key, payload, etag=None):
+    # Write to a temp file and rename over the entry, so a reader (another
+    # plugin invocation or the prefetch thread) never sees partial JSON.
+    # The response's ETag, if any, goes in a .etag file next to it.
+    global _cache_bytes
+    ts = time.time()
+    _mem_put(key, ts, payload)
     path = _cache_path(key)
+    tmp = None
+    reserved = 0
     try:
-        with open(path, "w") as f:
-            json.dump({"_ts": time.time(), "payload": payload}, f)
+        _ensure_cache_dir()
+        data = _json_dumps(payload)
+        # Replacing an entry frees its old size, so refreshes still go to
+        # disk once the limit is reached; only new entries are refused
+        try:
+            old_size = os.stat(path).st_size
+            replacing = True
+        except OSError:
+            old_size = 0
+            replacing = False
+        delta = len(data) - old_size
+        with _size_lock:
+            size = _cache_size()
+            if not replacing and size + delta > CACHE_LIMIT_BYTES:
+                return
+            _cache_bytes = size + delta
+        reserved = delta
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        tmp = None
+        reserved = 0
+        etag_path = _cache_path(key, ".etag")
+        if etag:
+            with open(etag_path, "w") as f:
+                f.write(etag)
+        elif os.path.exists(etag_path):
+            os.remove(etag_path)
     except Exception:
+        if tmp:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        if reserved:
+            with _size_lock:
+                _cache_bytes -= reserved
+
+
+def _cache_touch(key, payload):
+    """Mark an existing entry as freshly written without rewriting it."""
+    try:
+        os.utime(_cache_path(key), None)
+    except OSError:
         pass
+    _mem_put(key, time.time(), payload)
+
+
+def cache_get(key, ttl=None):
+    """Return the cached value for key, or None if missing or older than
+    ttl seconds (CACHE_TTL by default).
+
+    For other modules of the addon (e.g. brightcove) that keep small
+    entries of their own in this cache.
+    """
+    return _cache_get(key, ttl)
+
+
+def cache_set(key, value):
+    """Store a JSON-serialisable value under key."""
+    _cache_set(key, value)
+
+
+def cache_delete(key):
+    """Remove key from the cache, if present."""
+    with _mem_lock:
+        _MEM_CACHE.pop(key, None)
+    for ext in (".json", ".etag"):
+        try:
+            os.remove(_cache_path(key, ext))
+        except OSError:
+            pass
 
 
-def _cached_fetch(cache_key, fetch_fn):
-    """Check cache first, otherwise call fetch_fn(), cache the result, and return it."""
-    cached = _cache_get(cache_key)
+def clear_cache():
+    """Delete all cached API responses, on disk and in memory."""
+    global _cache_bytes
+    with _mem_lock:
+        _MEM_CACHE.clear()
+    try:
+        entries = list(os.scandir(CACHE_DIR))
+    except OSError:
+        entries = []
+    for entry in entries:
+        if entry.name.endswith((".json", ".etag", ".tmp")):
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+    with _size_lock:
+        _cache_bytes = 0
+
+
+def _canonical_key(params):
+    """Order-independent, hashable form of a request's params for cache keys.
+
+    List values (repeated filter keys) are sorted too, since the API ORs
+    them regardless of order.
+    """
+    return tuple(sorted(
+        (k, tuple(sorted(v)) if isinstance(v, list) else v)
+        for k, v in params.items()
+    ))
+
+
+# cache_key -> Future of the fetch currently running for it
+_INFLIGHT = {}
+_inflight_lock = threading.Lock()
+
+
+def _cached_fetch(cache_key, fetch_fn, ttl=None):
+    """Check cache first, otherwise call fetch_fn(), cache the result, and return it.
+
+    Concurrent misses on the same key (e.g. a prefetch worker and the UI
+    thread) share one fetch: later callers wait for the first one's result.
+    """
+    cached = _cache_get(cache_key, ttl)
     if cached is not None:
         return cached
-    result = fetch_fn()
+    from concurrent.futures import Future
+
+    with _inflight_lock:
+        future = _INFLIGHT.get(cache_key)
+        owner = future is None
+        if owner:
+            future = _INFLIGHT[cache_key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        result = _fetch_conditional(cache_key, fetch_fn)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+    finally:
+        with _inflight_lock:
+            del _INFLIGHT[cache_key]
+    return result
+
+
+class _NotModified(Exception):
+    """Raised by _api_post when a conditional request gets a 304."""
+
+
+# Conditional-request state for the fetch _cached_fetch is running on this
+# thread: the stored ETag to send, and the one the response came back with
+_conditional = threading.local()
+
+
+def _fetch_conditional(cache_key, fetch_fn):
+    """Run fetch_fn and cache its result, revalidating by ETag.
+
+    If the expired entry was stored with an ETag, _api_post sends it as
+    If-None-Match; on a 304 the old payload is renewed in place instead of
+    being downloaded and parsed again. fetch_fn is expected to make a
+    single API request.
+    """
+    etag_path = _cache_path(cache_key, ".etag")
+    try:
+        with open(etag_path) as f:
+            etag = f.read()
+    except OSError:
+        etag = None
+    _conditional.etag = etag
+    _conditional.response_etag = None
+    try:
+        result = fetch_fn()
+    except _NotModified:
+        result = None
+        stale = _cache_get(cache_key, float("inf"))
+        if stale is not None:
+            _cache_touch(cache_key, stale)
+            return stale
+    finally:
+        _conditional.etag = None
+    if result is None and etag:
+        # Either the entry vanished after a 304, or the server rejected the
+        # conditional POST (RFC 9110 answers a matching ETag on a POST with
+        # 412, which _api_post reports as None). Forget the ETag and retry
+        # unconditionally once.
+        try:
+            os.remove(etag_path)
+        except OSError:
+            pass
+        _conditional.response_etag = None
+        result = fetch_fn()
+        if result is None:
+            # Better a stale page than an empty listing
+            return _cache_get(cache_key, float("inf"))
     if result is not None:
-        _cache_set(cache_key, result)
+        _cache_set(cache_key, result, _conditional.response_etag)
     return result
 
 
+# ---------------------------------------------------------------------------
+# Next-page prefetch
+# ---------------------------------------------------------------------------
+
+_prefetch_pool = None
+_prefetch_lock = threading.Lock()
+_prefetch_inflight = set()
+_prefetch_local = threading.local()
+
+
+def _prefetch_run(key, fetch_fn, kwargs):
+    _prefetch_local.active = True
+    try:
+        fetch_fn(**kwargs)
+    except Exception:
+        pass
+    finally:
+        with _prefetch_lock:
+            _prefetch_inflight.discard(key)
+
+
+def _prefetch_after(fetch_fn, page, page_size, total, **kwargs):
+    """Warm the cache for the pages following `page` in the background.
+
+    The pages are fetched through fetch_fn itself, so they land in the disk
+    cache via the normal path and the next "More sessions" click is a cache
+    hit. Calls made from a prefetch worker never prefetch further.
+    """
+    if getattr(_prefetch_local, "active", False):
+        return
+    limit = min(total, MAX_RESULTS)
+    for nxt in range(page + 1, page + 1 + PREFETCH_PAGES):
+        if nxt * page_size >= limit:
+            break
+        _prefetch_submit(fetch_fn, dict(kwargs, page=nxt, page_size=page_size))
+
+
+def _prefetch_events(events):
+    """Warm the first page of the newest PREFETCH_EVENTS event sections."""
+    if getattr(_prefetch_local, "active", False):
+        return
+    sections = [e for e in events if e.get("section_id")][:PREFETCH_EVENTS]
+    for e in sections:
+        _prefetch_submit(search_event_sessions, {
+            "section_id": e["section_id"], "page": 0, "page_size": PAGE_SIZE,
+            "event_name": e["name"], "filters": None,
+        })
+
+
+def _prefetch_submit(fetch_fn, kwargs):
+    global _prefetch_pool
+    key = (fetch_fn.__name__, json.dumps(kwargs, sort_keys=True))
+    with _prefetch_lock:
+        if key in _prefetch_inflight:
+            return
+        _prefetch_inflight.add(key)
+        if _prefetch_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _prefetch_pool = ThreadPoolExecutor(max_workers=2)
+    # Worker threads are joined at interpreter exit, so the cache write
+    # finishes before Kodi tears the plugin process down
+    _prefetch_pool.submit(_prefetch_run, key, fetch_fn, kwargs)
+
+
 def _api_post(endpoint, params, profile_id=None):
     """POST to RainFocus API and return parsed JSON.
     
@@ -189,6 +546,8 @@ def _api_post(endpoint, params, profile_id=None):
     (e.g. {"search.technology": ["a", "b"]} -> "search.technology=a&search.technology=b").
     
     Returns parsed JSON dict on success, or None on network/API failure.
+    Inside _cached_fetch the request is made conditional on the stored
+    ETag, and a 304 raises _NotModified.
     """
     url = API_URL.format(endpoint=endpoint)
     # Build body with support for repeated keys (list values)
@@ -200,15 +559,22 @@ def _api_post(endpoint, params, profile_id=None):
         else:
             pairs.append((k, v))
     body = urlencode(pairs).encode("utf-8")
-    headers = dict(HEADERS)
+    headers = HEADERS
     if profile_id:
-        headers["rfApiProfileId"] = profile_id
-    req = Request(url, data=body, headers=headers)
-    try:
-        resp = urlopen(req, timeout=30)
-        return json.loads(resp.read().decode("utf-8"))
-    except (HTTPError, URLError):
+        headers = (_PROFILE_HEADERS.get(profile_id)
+                   or dict(HEADERS, rfApiProfileId=profile_id))
+    etag = getattr(_conditional, "etag", None)
+    if etag:
+        headers = dict(headers, **{"If-None-Match": etag})
+    resp = _http.request("POST", url, body=body, headers=headers, timeout=30)
+    if resp is None:
         return None
+    if resp.status == 304 and etag:
+        raise _NotModified()
+    if resp.status != 200:
+        return None
+    _conditional.response_etag = resp.headers.get("ETag")
+    return _json_loads(_http.decoded_body(resp))
 
 
 def search_sessions(page=0, page_size=PAGE_SIZE, filters=None, profile_id=None):
@@ -239,26 +605,29 @@ def search_sessions(page=0, page_size=PAGE_SIZE, filters=None, profile_id=None):
     if filters:
         params.update(filters)
 
-    cache_key = "search:{}:{}".format(profile_id or "default",
-                                       json.dumps(params, sort_keys=True))
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
-
-    data = _api_post("search", params, profile_id=profile_id)
-    if not data:
+    cache_key = "search:{}:{!r}".format(profile_id or "default",
+                                         _canonical_key(params))
+    def _fetch():
+        data = _api_post("search", params, profile_id=profile_id)
+        if not data:
+            return None
+        section = data.get("sectionList", [{}])[0] if data.get("sectionList") else {}
+        items = section.get("items", [])
+        total = section.get("total", 0)
+
+        return {
+            "items": [_parse_item(i) for i in items],
+            "total": total,
+            "page": page,
+            "page_size": effective_size,
+        }
+
+    result = _cached_fetch(cache_key, _fetch)
+    if result is None:
         return {"items": [], "total": 0, "page": page, "page_size": effective_size}
-    section = data.get("sectionList", [{}])[0] if data.get("sectionList") else {}
-    items = section.get("items", [])
-    total = section.get("total", 0)
-
-    result = {
-        "items": [_parse_item(i) for i in items],
-        "total": total,
-        "page": page,
-        "page_size": effective_size,
-    }
-    _cache_set(cache_key, result)
+
+    _prefetch_after(search_sessions, page, effective_size, result["total"],
+                    filters=filters, profile_id=profile_id)
     return result
 
 
@@ -272,41 +641,32 @@ def discover_event_sections():
     Returns:
         list of dicts with keys: name, section_id, total, catalog
     """
-    cache_key = "event_sections"
-    cached = _cache_get(cache_key)
+    cache_key = _EVENTS_CACHE_KEY
+    cached = _cache_get(cache_key, EVENTS_CACHE_TTL)
     if cached:
+        _prefetch_events(cached)
         return cached
 
-    events = []
+    # Copy: the current-catalog list is itself a cached payload
+    events = list(_current_event_sections())
 
-    # Current catalog (2022+) - requires sections=true
+    # Legacy catalog (2018-2021) - no sections, discover from items.
+    # The pages are independent, so fetch them concurrently (each worker
+    # thread keeps its own pooled connection) and tally them in order.
     try:
-        data = _api_post("search", {
-            "type": "session", "size": "1", "sections": "true"
-        }, profile_id=CURRENT_PROFILE_ID)
-        if data:
-            for s in data.get("sectionList", []):
-            sid = s.get("sectionId", "")
-            total = s.get("total", 0)
-            items = s.get("items", [])
-            name = items[0].get("event", "") if items else ""
-            if name and sid != "otherItems":
-                events.append({
-                    "name": name,
-                    "section_id": sid,
-                    "total": total,
-                    "catalog": "current",
-                })
-    except Exception:
-        pass
+        from concurrent.futures import ThreadPoolExecutor
 
-    # Legacy catalog (2018-2021) - no sections, discover from items
-    try:
-        legacy_events = {}
-        for offset in range(0, 500, 50):
-            data = _api_post("search", {
-                "type": "session", "size": "50", "from": str(offset)
+        def _legacy_page(offset):
+            return _api_post("search", {
+                "type": "session", "size": str(PAGE_SIZE), "from": str(offset)
             }, profile_id=LEGACY_PROFILE_ID)
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            pages = list(pool.map(_legacy_page,
+                                  range(0, MAX_RESULTS, PAGE_SIZE)))
+
+        legacy_events = {}
+        for data in pages:
             if not data:
                 break
             for s in data.get("sectionList", []):
@@ -328,9 +688,58 @@ def discover_event_sections():
 
     if events:
         _cache_set(cache_key, events)
+        _prefetch_events(events)
     return events
 
 
+def _current_event_sections():
+    """Current catalog (2022+) events, one per section; requires sections=true.
+
+    Cached on its own so warm_cache() can fetch it without the legacy scan.
+    """
+    def _fetch():
+        # No try here: _api_post already returns None on network failure,
+        # and _NotModified must reach _fetch_conditional
+        data = _api_post("search", {
+            "type": "session", "size": "1", "sections": "true"
+        }, profile_id=CURRENT_PROFILE_ID)
+        if not data:
+            return None
+        events = []
+        for s in data.get("sectionList", []):
+            sid = s.get("sectionId", "")
+            total = s.get("total", 0)
+            items = s.get("items", [])
+            name = items[0].get("event", "") if items else ""
+            if name and sid != "otherItems":
+                events.append({
+                    "name": name,
+                    "section_id": sid,
+                    "total": total,
+                    "catalog": "current",
+                })
+        return events or None
+
+    return _cached_fetch(_CURRENT_EVENTS_CACHE_KEY, _fetch,
+                         EVENTS_CACHE_TTL) or []
+
+
+def warm_cache(filters=None):
+    """Fetch the current-catalog event sections and the first page of a
+    search in the background when the cache is cold.
+
+    Meant for the main menu, so the first listing click is served from disk.
+    Bounded to those two requests: the ten-page legacy catalog scan is left
+    to discover_event_sections(). Does nothing if the event list is cached.
+    """
+    if _cache_get(_EVENTS_CACHE_KEY, EVENTS_CACHE_TTL) is not None:
+        return
+    _prefetch_submit(_current_event_sections, {})
+    _prefetch_submit(search_sessions, {
+        "page": 0, "page_size": PAGE_SIZE, "filters": filters,
+    })
+
+
 def search_event_sessions(section_id, page=0, page_size=PAGE_SIZE,
                           event_name=None, filters=None):
     """
@@ -364,43 +773,44 @@ def search_event_sessions(section_id, page=0, page_size=PAGE_SIZE,
     if filters:
         params.update(filters)
 
-    # Build a stable cache key (convert lists to sorted comma-joined strings)
-    cache_params = {}
-    for k, v in params.items():
-        cache_params[k] = ",".join(sorted(v)) if isinstance(v, list) else v
-    cache_key = "eventsec:{}:{}".format(section_id,
-                                         json.dumps(cache_params, sort_keys=True))
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
+    cache_key = "eventsec:{}:{!r}".format(section_id, _canonical_key(params))
+    def _fetch():
+        data = _api_post("search", params, profile_id=CURRENT_PROFILE_ID)
+        if not data:
+            return None
 
-    data = _api_post("search", params, profile_id=CURRENT_PROFILE_ID)
-    if not data:
-        return {"items": [], "total": 0, "page": page, "page_size": effective_size}
+        # Find the matching section
+        target_items = []
+        target_total = 0
+        for s in data.get("sectionList", []):
+            if s.get("sectionId") == section_id:
+                target_items = s.get("items", [])
+                target_total = s.get("total", 0)
+                break
 
-    # Find the matching section
-    target_items = []
-    target_total = 0
-    for s in data.get("sectionList", []):
-        if s.get("sectionId") == section_id:
-            target_items = s.get("items", [])
-            target_total = s.get("total", 0)
-            break
+        return {
+            "items": [_parse_item(i) for i in target_items],
+            "total": target_total,
+            "page": page,
+            "page_size": effective_size,
+        }
 
-    result = {
-        "items": [_parse_item(i) for i in target_items],
-        "total": target_total,
-        "page": page,
-        "page_size": effective_size,
-    }
-    _cache_set(cache_key, result)
+    result = _cached_fetch(cache_key, _fetch)
+    if result is None:
+        return {"items": [], "total": 0, "page": page, "page_size": effective_size}
+
+    _prefetch_after(search_event_sessions, page, effective_size,
+                    result["total"], section_id=section_id,
+                    event_name=event_name, filters=filters)
     return result
 
 
 def get_session(session_id):
     """Fetch a single session by its RainFocus ID."""
+    # Repeated Info opens are served by the in-memory L1 of _cache_get,
+    # which only ever holds successful lookups; failures are retried
     cache_key = "session:" + session_id
-    cached = _cache_get(cache_key)
+    cached = _cache_get(cache_key, SESSION_CACHE_TTL)
     if cached:
         return cached
 
@@ -435,12 +845,15 @@ def get_session_types():
     return SESSION_TYPES
 
 
+_BC_PREFIX = (
+    "https://players.brightcove.net/{account}/{player}_default/"
+    "index.html?videoId="
+).format(account=BRIGHTCOVE_ACCOUNT, player=BRIGHTCOVE_PLAYER)
+
+
 def brightcove_url(video_id):
     """Build a Brightcove player URL for the given video ID."""
-    return (
-        "https://players.brightcove.net/{account}/{player}_default/"
-        "index.html?videoId={vid}"
-    ).format(account=BRIGHTCOVE_ACCOUNT, player=BRIGHTCOVE_PLAYER, vid=video_id)
+    return _BC_PREFIX + str(video_id)
 
 
 def discover_events():
@@ -452,24 +865,24 @@ def discover_events():
         List of event dicts with id, name, sessions
     """
     try:
-        # Do a search with no filters to get all events
-        result = search_sessions(page=0, page_size=1, filters={})
-        
         # Extract unique events from section headers
         events_found = []
+        seen = set()
         data = _api_post("search", {"type": "session", "size": "1", "from": "0"})
         if not data:
             return EVENTS
         
         for section in data.get("sectionList", []):
-            heading = section.get("sectionHeading", "")
-            if heading and heading not in [e["name"] for e in events_found]:
+            get = section.get
+            heading = get("sectionHeading", "")
+            if heading and heading not in seen:
+                seen.add(heading)
                 # Try to infer an ID from the name
                 event_id = heading.lower().replace(" ", "").replace("-", "")
                 events_found.append({
                     "id": event_id,
                     "name": heading,
-                    "sessions": section.get("total", 0)
+                    "sessions": get("total", 0)
                 })
         
         if events_found:
@@ -481,46 +894,61 @@ def discover_events():
     return EVENTS
 
 
-def _parse_item(item):
-    """Extract the fields we care about from a raw RainFocus session item."""
-    videos = item.get("videos", [])
-    video_ids = [v["url"] for v in videos if v.get("url")]
+# attributevalues "attribute" name -> single-valued field it fills
+# ("Technology" is multi-valued and handled separately)
+_ATTR_FIELDS = {
+    "Technical Level": "level",
+    "Session Type": "session_type",
+    "Type": "session_type",
+}
 
-    participants = item.get("participants", [])
-    speakers = [p.get("fullName", p.get("globalFullName", "")) for p in participants]
-    speaker_photos = [p.get("photoURL", p.get("globalPhotoURL", "")) for p in participants]
 
-    # Get technology/level from attributevalues
+def _parse_item(item):
+    """Extract the fields we care about from a raw RainFocus session item."""
+    g = item.get
+    video_ids = [u for u in (v.get("url") for v in g("videos", [])) if u]
+
+    # The global* fallbacks are only looked up when the local field is
+    # missing or empty
+    participants = g("participants", [])
+    speakers = [p.get("fullName") or p.get("globalFullName") or ""
+                for p in participants]
+    speaker_photos = [p.get("photoURL") or p.get("globalPhotoURL") or ""
+                      for p in participants]
+
+    # Get technology/level/type from attributevalues
     techs = []
-    level = ""
-    session_type = ""
-    for av in item.get("attributevalues", []):
+    add_tech = techs.append
+    fields = {"level": "", "session_type": ""}
+    attr_fields = _ATTR_FIELDS
+    for av in g("attributevalues", []):
         attr = av.get("attribute", "")
-        val = av.get("value", "")
         if attr == "Technology":
-            techs.append(val)
-        elif attr == "Technical Level":
-            level = val
-        elif attr in ("Session Type", "Type"):
-            session_type = val
+            add_tech(av.get("value", ""))
+        else:
+            field = attr_fields.get(attr)
+            if field:
+                fields[field] = av.get("value", "")
+
+    title = g("title") or ""
 
     duration = 0.0
-    if item.get("times"):
-        duration = float(item["times"][0].get("length", 0)) * 60  # minutes to seconds
+    times = g("times")
+    if times:
+        duration = float(times[0].get("length", 0)) * 60  # minutes to seconds
 
     return {
-        "id": item.get("sessionID", item.get("externalID", "")),
-        "code": item.get("code", ""),
-        "title": item.get("title", ""),
-        "abstract": item.get("abstract", ""),
-        "event": item.get("event", ""),
-        "event_label": item.get("eventLabel", ""),
-        "event_code": item.get("eventCode", ""),
+        "id": g("sessionID", g("externalID", "")),
+        "code": g("code", ""),
+        "title": title,
+        "_title_key": title.lower(),  # precomputed case-insensitive sort key
+        "abstract": g("abstract", ""),
+        "event": g("event", ""),
         "speakers": speakers,
         "speaker_photos": speaker_photos,
         "technologies": techs,
-        "level": level,
-        "session_type": session_type or item.get("type", ""),
+        "level": fields["level"],
+        "session_type": fields["session_type"] or g("type", ""),
         "video_ids": video_ids,
         "duration": duration,
         "has_video": len(video_ids) > 0,